@@ -6,8 +6,13 @@ from mdpath.src.graph import (
 )
 from mdpath.src.mutual_information import NMI_calc
 from typing import Dict, Set, Tuple, List
+from multiprocessing import Pool
+from tqdm import tqdm
 import os
 
+worker_args = None
+
+
 def create_bootstrap_sample(df: pd.DataFrame) -> tuple[int, set[tuple]]:
     """Creates a sample from the dataframe with replacement for bootstrap analysis.
 
@@ -17,8 +22,12 @@ def create_bootstrap_sample(df: pd.DataFrame) -> tuple[int, set[tuple]]:
     Returns:
         bootstrap_sample (pd.DataFrame): Pandas dataframe containing the frames for the bootstrap analysis.
     """
-    bootstrap_sample = df.apply(
-        lambda col: col.sample(n=len(df), replace=True).reset_index(drop=True)
+    values = df.to_numpy()
+    num_frames, num_residues = values.shape
+    rng = np.random.default_rng()
+    indices = rng.integers(0, num_frames, size=(num_frames, num_residues))
+    bootstrap_sample = pd.DataFrame(
+        np.take_along_axis(values, indices, axis=0), columns=df.columns
     )
     return bootstrap_sample
 
@@ -31,6 +40,7 @@ def process_bootstrap_sample(
     numpath: int,
     sample_num: int,
     num_bins: int = 35,
+    quiet: bool = False,
 ) -> Tuple[int, List[List[int]]]:
     """Process a bootstrap sample to find common paths with the original sample.
 
@@ -41,15 +51,16 @@ def process_bootstrap_sample(
         pathways_set (set[tuple]): Set of tuples with the pathways for bootstrapping.
         numpath (int): Amount of top paths to consider.
         num_bins (int, optional): Number of bins to group dihedral angle movements into for NMI calculation. Defaults to 35.
+        quiet (bool, optional): Hide the progress bar of the NMI calculation. Defaults to False.
 
     Returns:
         common_count (int): Number of common paths between the bootstrap sample and the original sample.
         bootstrap_pathways (list[list[int]]): List of paths within the bootstrap sample.
     """
     bootstrap_sample = create_bootstrap_sample(df_all_residues)
-    bootstrap_mi_diff = NMI_calc(bootstrap_sample, num_bins=num_bins)
+    bootstrap_mi_diff = NMI_calc(bootstrap_sample, num_bins=num_bins, quiet=quiet)
     bootstrap_residue_graph = graph_assign_weights(
-        residue_graph_empty, bootstrap_mi_diff
+        residue_graph_empty.copy(), bootstrap_mi_diff
     )
     bootstrap_path_total_weights = collect_path_total_weights(
         bootstrap_residue_graph, df_distant_residues
@@ -70,6 +81,46 @@ def process_bootstrap_sample(
     return common_count, bootstrap_pathways
 
 
+def init_bootstrap_worker(*args) -> None:
+    """Stores the data shared by all bootstrap samples once per worker process.
+
+    Args:
+        args (tuple): Arguments of process_bootstrap_sample except for the sample number.
+    """
+    global worker_args
+    worker_args = args
+
+
+def process_bootstrap_sample_wrapper(sample_num: int) -> Tuple[int, List[List[int]]]:
+    """Wrapper function for processing a bootstrap sample in a worker process.
+
+    Args:
+        sample_num (int): Number of the bootstrap sample.
+
+    Returns:
+        common_count (int): Number of common paths between the bootstrap sample and the original sample.
+        bootstrap_pathways (list[list[int]]): List of paths within the bootstrap sample.
+    """
+    (
+        df_all_residues,
+        residue_graph_empty,
+        df_distant_residues,
+        pathways_set,
+        numpath,
+        num_bins,
+    ) = worker_args
+    return process_bootstrap_sample(
+        df_all_residues,
+        residue_graph_empty,
+        df_distant_residues,
+        pathways_set,
+        numpath,
+        sample_num=sample_num,
+        num_bins=num_bins,
+        quiet=True,
+    )
+
+
 def bootstrap_analysis(
     df_all_residues: pd.DataFrame,
     residue_graph_empty: Dict,
@@ -78,6 +129,7 @@ def bootstrap_analysis(
     num_bootstrap_samples: int,
     numpath: int,
     num_bins: int = 35,
+    num_processes: int = 1,
 ) -> Tuple[np.ndarray, Dict]:
     """Analyse the common paths between the original sample and bootstrap samples.
 
@@ -89,6 +141,7 @@ def bootstrap_analysis(
         num_bootstrap_samples (int): Amount of samples to generate for bootstrap analysis.
         numpath (int): Number of top paths to consider.
         num_bins (int, optional): Number of bins to group dihedral angle movements into for NMI calculation. Defaults to 35.
+        num_processes (int, optional): Number of processes processing bootstrap samples in parallel. Defaults to 1.
 
     Returns:
         common_counts (np.array): Array with the counts of common paths between the original sample and bootstrap samples.
@@ -100,16 +153,43 @@ def bootstrap_analysis(
     results = []
     path_occurrences = {tuple(path): [] for path in pathways_set}
 
-    for _ in range(num_bootstrap_samples):
-        result, occurrences = process_bootstrap_sample(
-            df_all_residues,
-            residue_graph_empty,
-            df_distant_residues,
-            pathways_set,
-            numpath,
-            sample_num = _,
-            num_bins=num_bins,
-        )
+    if num_processes > 1:
+        with Pool(
+            processes=num_processes,
+            initializer=init_bootstrap_worker,
+            initargs=(
+                df_all_residues,
+                residue_graph_empty,
+                df_distant_residues,
+                pathways_set,
+                numpath,
+                num_bins,
+            ),
+        ) as pool:
+            bootstrap_results = list(
+                tqdm(
+                    pool.imap(
+                        process_bootstrap_sample_wrapper, range(num_bootstrap_samples)
+                    ),
+                    total=num_bootstrap_samples,
+                    desc="\033[1mProcessing bootstrap samples\033[0m",
+                )
+            )
+    else:
+        bootstrap_results = [
+            process_bootstrap_sample(
+                df_all_residues,
+                residue_graph_empty,
+                df_distant_residues,
+                pathways_set,
+                numpath,
+                sample_num=sample_num,
+                num_bins=num_bins,
+            )
+            for sample_num in range(num_bootstrap_samples)
+        ]
+
+    for result, occurrences in bootstrap_results:
         results.append(result)
         current_paths = set(tuple(path) for path in occurrences)
         for path in path_occurrences.keys():
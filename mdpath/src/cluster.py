@@ -1,7 +1,6 @@
 import pandas as pd
 import numpy as np
-from multiprocessing import Pool, Manager
-from tqdm import tqdm
+from itertools import product
 from scipy.cluster import hierarchy
 from sklearn.metrics import silhouette_score
 import matplotlib.pyplot as plt
@@ -20,48 +19,57 @@ def calculate_overlap_for_pathway(
         result (list[dict]): List of dictionaries with the overlap between the given pathway and all other pathways.
     """
     i, path1, pathways, df = args
+    close_pairs = set(map(frozenset, df[["Residue1", "Residue2"]].to_numpy().tolist()))
     result = []
     for j in range(i + 1, len(pathways)):
-        if i != j:
-            path2 = pathways[j]
-            overlap_counter = 0
-            for res1 in path1:
-                for res2 in path2:
-                    if ((df["Residue1"] == res1) & (df["Residue2"] == res2)).any() or (
-                        (df["Residue1"] == res2) & (df["Residue2"] == res1)
-                    ).any():
-                        overlap_counter += 1
-            result.append({"Pathway1": i, "Pathway2": j, "Overlap": overlap_counter})
-            result.append({"Pathway1": j, "Pathway2": i, "Overlap": overlap_counter})
+        path2 = pathways[j]
+        overlap_counter = sum(
+            frozenset((res1, res2)) in close_pairs
+            for res1, res2 in product(path1, path2)
+        )
+        result.append({"Pathway1": i, "Pathway2": j, "Overlap": overlap_counter})
+        result.append({"Pathway1": j, "Pathway2": i, "Overlap": overlap_counter})
     return result
 
 
 def calculate_overlap_parallel(
-    pathways: list[list[int]], df: pd.DataFrame, num_processes: int
+    pathways: list[list[int]], df: pd.DataFrame, num_processes: int | None = None
 ) -> pd.DataFrame:
-    """Parallelization wrapper for the calculate_overlap_for_pathway function.
+    """Calculates the overlap between all pathways as a single matrix product.
+
+    Pathways are encoded as a residue incidence matrix P and close residue pairs as a symmetric adjacency matrix A,
+    so that P @ A @ P.T holds the overlap counts of calculate_overlap_for_pathway for all pathway pairs.
 
     Args:
         pathways (list[list[int]]): List of all pathways.
         df (pd.DataFrame): Pandas dataframe with close residue pairs.
-        num_processes (int): Number of processes to use for parallelization.
+        num_processes (int | None, optional): Deprecated and ignored, the matrix product is multithreaded by BLAS. Defaults to None.
 
     Returns:
         overlap_df (pd.DataFrame): Pandas dataframe with the overlap between all pathways and all other pathways.
     """
-    args = [(i, path, pathways, df) for i, path in enumerate(pathways)]
-    results = []
-    with Pool(processes=num_processes) as pool:
-        with tqdm(
-            total=len(args),
-            ascii=True,
-            desc="\033[1mCalculating pathway residue overlap\033[0m",
-        ) as pbar:
-            for result in pool.imap_unordered(calculate_overlap_for_pathway, args):
-                results.extend(result)
-                pbar.update(1)
-
-    overlap_df = pd.DataFrame(results, columns=["Pathway1", "Pathway2", "Overlap"])
+    residue_index = {
+        res: k
+        for k, res in enumerate(sorted({res for path in pathways for res in path}))
+    }
+    incidence = np.zeros((len(pathways), len(residue_index)), dtype=np.float32)
+    for k, path in enumerate(pathways):
+        np.add.at(incidence[k], [residue_index[res] for res in path], 1)
+    adjacency = np.zeros((len(residue_index), len(residue_index)), dtype=np.float32)
+    for res1, res2 in df[["Residue1", "Residue2"]].to_numpy().tolist():
+        if res1 in residue_index and res2 in residue_index:
+            a, b = residue_index[res1], residue_index[res2]
+            adjacency[a, b] = adjacency[b, a] = 1
+    overlap = np.rint(incidence @ adjacency @ incidence.T).astype(int)
+
+    rows, cols = np.triu_indices(len(pathways), k=1)
+    overlap_df = pd.DataFrame(
+        {
+            "Pathway1": np.column_stack([rows, cols]).ravel(),
+            "Pathway2": np.column_stack([cols, rows]).ravel(),
+            "Overlap": np.repeat(overlap[rows, cols], 2),
+        }
+    )
     return overlap_df
 
 
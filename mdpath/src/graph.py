@@ -1,10 +1,13 @@
 import networkx as nx
+import numpy as np
 import pandas as pd
-from tqdm import tqdm
-from itertools import combinations
-from Bio import PDB
-from typing import Tuple, List
-from mdpath.src.structure import calculate_distance
+from multiprocessing import Pool
+from scipy import sparse
+from scipy.sparse import csgraph
+from typing import Tuple, List, Dict, Optional
+from mdpath.src.structure import heavy_atom_coordinates, residue_contacts
+
+worker_graph_arrays = None
 
 
 def graph_building(pdb_file: str, end: int, dist=5.0) -> nx.Graph:
@@ -18,28 +21,24 @@ def graph_building(pdb_file: str, end: int, dist=5.0) -> nx.Graph:
     Returns:
         residue_graph (nx.Graph): Graph of residues within a certain distance of each other.
     """
+    coords, res_ids = heavy_atom_coordinates(pdb_file)
+    df_contacts = residue_contacts(coords, res_ids, end, [dist])[dist]
+    return contact_graph(df_contacts)
+
+
+def contact_graph(df_contacts: pd.DataFrame) -> nx.Graph:
+    """Generates a graph of residues from residue pairs in contact.
+
+    Args:
+        df_contacts (pd.DataFrame): Pandas dataframe with close residue pairs.
+
+    Returns:
+        residue_graph (nx.Graph): Graph with an edge for every residue pair in contact.
+    """
     residue_graph = nx.Graph()
-    parser = PDB.PDBParser(QUIET=True)
-    structure = parser.get_structure("pdb_structure", pdb_file)
-    heavy_atoms = ["C", "N", "O", "S"]
-    residues = [res for res in structure.get_residues() if PDB.Polypeptide.is_aa(res)]
-    for res1, res2 in tqdm(
-        combinations(residues, 2),
-        desc="\033[1mBuilding residue graph\033[0m",
-        total=len(residues) * (len(residues) - 1) // 2,
-    ):
-        res1_id = res1.get_id()[1]
-        res2_id = res2.get_id()[1]
-        if res1_id <= end and res2_id <= end:
-            for atom1 in res1:
-                if atom1.element in heavy_atoms:
-                    for atom2 in res2:
-                        if atom2.element in heavy_atoms:
-                            distance = calculate_distance(atom1.coord, atom2.coord)
-                            if distance <= dist:
-                                residue_graph.add_edge(
-                                    res1.get_id()[1], res2.get_id()[1], weight=0
-                                )
+    residue_graph.add_edges_from(
+        df_contacts[["Residue1", "Residue2"]].to_numpy().tolist(), weight=0
+    )
     return residue_graph
 
 
@@ -53,14 +52,14 @@ def graph_assign_weights(residue_graph: nx.Graph, mi_diff_df: pd.DataFrame) -> n
     Returns:
         residue_graph (nx.Graph): Residue graph with edge weights assigned.
     """
-    for edge in residue_graph.edges():
-        u, v = edge
-        pair = ("Res " + str(u), "Res " + str(v))
-        if pair in mi_diff_df["Residue Pair"].apply(tuple).tolist():
-            weight = mi_diff_df.loc[
-                mi_diff_df["Residue Pair"].apply(tuple) == pair, "MI Difference"
-            ].values[0]
-            residue_graph.edges[edge]["weight"] = weight
+    weights = dict(
+        zip(mi_diff_df["Residue Pair"].map(tuple), mi_diff_df["MI Difference"].values)
+    )
+    labels = {node: f"Res {node}" for node in residue_graph.nodes}
+    for u, v, edge_data in residue_graph.edges(data=True):
+        weight = weights.get((labels[u], labels[v]))
+        if weight is not None:
+            edge_data["weight"] = weight
     return residue_graph
 
 
@@ -78,43 +77,192 @@ def max_weight_shortest_path(
         best_path (List[int]): List of nodes in the shortest path with the highest weight.
         total_weight (float): Total weight of the shortest path.
     """
-    all_shortest_paths = list(
-        nx.all_shortest_paths(graph, source=source, target=target)
+    if source not in graph:
+        raise nx.NodeNotFound(f"Source {source} is not in G")
+    # Breadth-first search layer by layer, keeping the heaviest predecessor of every node
+    best = {source: (0, None)}
+    frontier = [source]
+    while frontier and target not in best:
+        layer = {}
+        for node in frontier:
+            node_weight = best[node][0]
+            for neighbor, edge in graph[node].items():
+                if neighbor in best:
+                    continue
+                path_weight = node_weight + edge["weight"]
+                if neighbor not in layer or path_weight > layer[neighbor][0]:
+                    layer[neighbor] = (path_weight, node)
+        best.update(layer)
+        frontier = list(layer)
+    if target not in best:
+        raise nx.NetworkXNoPath(f"Target {target} cannot be reached from given sources")
+
+    max_weight = best[target][0]
+    best_path = [target]
+    while best_path[-1] != source:
+        best_path.append(best[best_path[-1]][1])
+    best_path.reverse()
+    return best_path, max_weight
+
+
+def graph_arrays(
+    residue_graph: nx.Graph,
+) -> Tuple[
+    List[int], Dict[int, int], np.ndarray, np.ndarray, np.ndarray, sparse.csr_array
+]:
+    """Converts a residue graph into index arrays for the shortest path search.
+
+    Args:
+        residue_graph (nx.Graph): Residue graph with edge weights.
+
+    Returns:
+        nodes (list[int]): Node at every index.
+        index (dict[int, int]): Index of every node.
+        tails (np.ndarray): Start index of every edge in both directions.
+        heads (np.ndarray): End index of every edge in both directions.
+        weights (np.ndarray): Weight of every edge in both directions.
+        adjacency (sparse.csr_array): Unweighted adjacency matrix.
+    """
+    nodes = list(residue_graph.nodes)
+    index = {node: i for i, node in enumerate(nodes)}
+    edges = list(residue_graph.edges(data="weight", default=0))
+    ends = np.array([(index[u], index[v]) for u, v, _ in edges], dtype=np.intp)
+    ends = ends.reshape(-1, 2)
+    edge_weights = np.array([weight for _, _, weight in edges], dtype=float)
+    tails = np.concatenate([ends[:, 0], ends[:, 1]])
+    heads = np.concatenate([ends[:, 1], ends[:, 0]])
+    weights = np.concatenate([edge_weights, edge_weights])
+    adjacency = sparse.csr_array(
+        (np.ones(len(tails)), (tails, heads)), shape=(len(nodes), len(nodes))
     )
+    return nodes, index, tails, heads, weights, adjacency
 
-    max_weight = -float("inf")
-    best_path = None
 
-    for path in all_shortest_paths:
-        path_weight = sum(
-            graph[path[i]][path[i + 1]]["weight"] for i in range(len(path) - 1)
-        )
-        if path_weight > max_weight:
-            max_weight = path_weight
-            best_path = path
+def max_weight_shortest_paths_from_source(
+    residue_graph_arrays: tuple, source: int, targets: List[int]
+) -> List[Optional[Tuple[List[int], float]]]:
+    """Finds the shortest paths with the highest total weight from one source node to several target nodes.
 
-    return best_path, max_weight
+    Args:
+        residue_graph_arrays (tuple): Index arrays of the graph as returned by graph_arrays.
+        source (int): Starting node.
+        targets (list[int]): Target nodes.
+
+    Returns:
+        paths (list[tuple[list[int], float] | None]): Shortest path with the highest weight and its total weight for every target, None if there is no path.
+    """
+    nodes, index, tails, heads, weights, adjacency = residue_graph_arrays
+    if source not in index:
+        raise nx.NodeNotFound(f"Source {source} is not in G")
+    source_index = index[source]
+    hops = csgraph.shortest_path(adjacency, unweighted=True, indices=source_index)
+    target_indices = [index.get(target) for target in targets]
+    target_hops = [hops[i] for i in target_indices if i is not None]
+    max_hops = max((h for h in target_hops if np.isfinite(h)), default=0)
+
+    # Only edges leading one layer further away from the source lie on shortest paths,
+    # layers beyond the farthest target are not needed
+    forward = (hops[heads] <= max_hops) & (hops[heads] == hops[tails] + 1)
+    order = np.argsort(hops[heads[forward]], kind="stable")
+    tails = tails[forward][order]
+    heads = heads[forward][order]
+    weights = weights[forward][order]
+    splits = np.flatnonzero(np.diff(hops[heads])) + 1
+
+    best = np.full(len(nodes), -np.inf)
+    best[source_index] = 0.0
+    predecessor = np.full(len(nodes), -1, dtype=np.intp)
+    for layer_tails, layer_heads, layer_weights in zip(
+        np.split(tails, splits), np.split(heads, splits), np.split(weights, splits)
+    ):
+        candidates = best[layer_tails] + layer_weights
+        order = np.lexsort((-candidates, layer_heads))
+        _, first = np.unique(layer_heads[order], return_index=True)
+        chosen = order[first]
+        best[layer_heads[chosen]] = candidates[chosen]
+        predecessor[layer_heads[chosen]] = layer_tails[chosen]
+
+    paths = []
+    for target_index in target_indices:
+        if target_index is None or not np.isfinite(hops[target_index]):
+            paths.append(None)
+            continue
+        path = [target_index]
+        while path[-1] != source_index:
+            path.append(predecessor[path[-1]])
+        paths.append(([nodes[i] for i in reversed(path)], float(best[target_index])))
+    return paths
+
+
+def init_path_worker(residue_graph_arrays: tuple) -> None:
+    """Stores the graph arrays once per worker process for parallel path searches.
+
+    Args:
+        residue_graph_arrays (tuple): Index arrays of the residue graph.
+    """
+    global worker_graph_arrays
+    worker_graph_arrays = residue_graph_arrays
+
+
+def max_weight_shortest_paths_wrapper(
+    source_targets: Tuple[int, List[int]],
+) -> List[Optional[Tuple[List[int], float]]]:
+    """Wrapper function for finding the max weight shortest paths from one source in a worker process.
+
+    Args:
+        source_targets (tuple[int, list[int]]): Source residue and its target residues.
+
+    Returns:
+        paths (list[tuple[list[int], float] | None]): Shortest path and total weight for every target, None if there is no path.
+    """
+    source, targets = source_targets
+    return max_weight_shortest_paths_from_source(worker_graph_arrays, source, targets)
 
 
 def collect_path_total_weights(
-    residue_graph: nx.Graph, df_distant_residues: pd.DataFrame
+    residue_graph: nx.Graph, df_distant_residues: pd.DataFrame, num_processes: int = 1
 ) -> list[tuple[list[int], float]]:
     """Wrapper function to collect the shortest path and total weight between distant residues.
 
     Args:
         residue_graph (nx.Graph): Residue graph.
         df_distant_residues (pd.DataFrame): Panda dataframe with distant residues.
+        num_processes (int, optional): Number of processes to use for parallelization. Defaults to 1.
 
     Returns:
         path_total_weights (list[tuple[list[int], float]]): List of tuples with the shortest path and total weight between distant residues.
     """
-    path_total_weights = []
-    for index, row in df_distant_residues.iterrows():
-        try:
-            shortest_path, total_weight = max_weight_shortest_path(
-                residue_graph, row["Residue1"], row["Residue2"]
+    residue_pairs = df_distant_residues[["Residue1", "Residue2"]].to_numpy().tolist()
+    targets_by_source = {}
+    for source, target in residue_pairs:
+        targets_by_source.setdefault(source, []).append(target)
+    source_targets = list(targets_by_source.items())
+    residue_graph_arrays = graph_arrays(residue_graph)
+    if num_processes > 1:
+        chunksize = max(1, len(source_targets) // (4 * num_processes))
+        with Pool(
+            processes=num_processes,
+            initializer=init_path_worker,
+            initargs=(residue_graph_arrays,),
+        ) as pool:
+            results = list(
+                pool.imap(
+                    max_weight_shortest_paths_wrapper,
+                    source_targets,
+                    chunksize=chunksize,
+                )
             )
-            path_total_weights.append((shortest_path, total_weight))
-        except nx.NetworkXNoPath:
-            continue
+    else:
+        results = [
+            max_weight_shortest_paths_from_source(residue_graph_arrays, source, targets)
+            for source, targets in source_targets
+        ]
+    paths = {}
+    for (source, targets), source_paths in zip(source_targets, results):
+        paths.update(zip(((source, target) for target in targets), source_paths))
+    path_total_weights = [
+        paths[(source, target)]
+        for source, target in residue_pairs
+        if paths[(source, target)] is not None
+    ]
     return path_total_weights
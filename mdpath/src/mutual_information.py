@@ -1,40 +1,84 @@
 import pandas as pd
 import numpy as np
 from tqdm import tqdm
-from sklearn.metrics import mutual_info_score
 from scipy.stats import entropy
 
 
-def NMI_calc(df_all_residues: pd.DataFrame, num_bins=35) -> pd.DataFrame:
+def bin_column(values: np.ndarray, num_bins: int) -> np.ndarray:
+    """Assigns every value of a column to one of num_bins equal-width bins, matching np.histogram.
+
+    Args:
+        values (np.ndarray): Dihedral angle movements of a single residue.
+        num_bins (int): Number of bins spanning the range of the values.
+
+    Returns:
+        codes (np.ndarray): Bin index of every value.
+    """
+    first_edge, last_edge = values.min(), values.max()
+    if first_edge == last_edge:
+        first_edge, last_edge = first_edge - 0.5, last_edge + 0.5
+    edges = np.linspace(first_edge, last_edge, num_bins + 1)
+    codes = np.searchsorted(edges, values, side="right") - 1
+    return np.clip(codes, 0, num_bins - 1)
+
+
+def mutual_information(hist_joint: np.ndarray) -> float:
+    """Calculates the mutual information of two variables from their joint histogram.
+
+    Args:
+        hist_joint (np.ndarray): Joint histogram (contingency table) of the two variables.
+
+    Returns:
+        mi (float): Mutual information in nats.
+    """
+    joint = hist_joint / hist_joint.sum()
+    marginal1 = joint.sum(axis=1)
+    marginal2 = joint.sum(axis=0)
+    nonzero = joint > 0
+    outer = np.outer(marginal1, marginal2)
+    mi = np.sum(joint[nonzero] * (np.log(joint[nonzero]) - np.log(outer[nonzero])))
+    return max(mi, 0.0)
+
+
+def NMI_calc(
+    df_all_residues: pd.DataFrame, num_bins=35, quiet: bool = False
+) -> pd.DataFrame:
     """Nornmalized Mutual Information calculation for all residue pairs.
 
     Args:
         df_all_residues (pd.DataFrame): Pandas dataframe with all residue dihedral angle movements.
         num_bins (int, optional): Number of bins to group dihedral angle movements into for mutual information calculation. Defaults to 35.
+        quiet (bool, optional): Hide the progress bar. Defaults to False.
 
     Returns:
         mi_diff_df (pd.DataFrame): Pandas dataframe with residue pair and mutual information difference.
     """
     normalized_mutual_info = {}
-    total_iterations = len(df_all_residues.columns) ** 2
+    columns = list(df_all_residues.columns)
+    values = df_all_residues.to_numpy()
+    binned = np.empty((len(columns), len(values)), dtype=np.intp)
+    for i in range(len(columns)):
+        binned[i] = bin_column(values[:, i], num_bins)
+    hists = [np.bincount(codes, minlength=num_bins) for codes in binned]
+    entropies = [entropy(hist) for hist in hists]
+    num_columns = len(columns)
+    total_iterations = num_columns * (num_columns - 1) // 2
     with tqdm(
         total=total_iterations,
         desc="\033[1mCalculating Normalized Mutual Information\033[0m",
+        disable=quiet,
     ) as progress_bar:
-        for col1 in df_all_residues.columns:
-            for col2 in df_all_residues.columns:
-                if col1 != col2:
-                    hist_col1, _ = np.histogram(df_all_residues[col1], bins=num_bins)
-                    hist_col2, _ = np.histogram(df_all_residues[col2], bins=num_bins)
-                    hist_joint, _, _ = np.histogram2d(
-                        df_all_residues[col1], df_all_residues[col2], bins=num_bins
-                    )
-                    mi = mutual_info_score(hist_col1, hist_col2, contingency=hist_joint)
-                    entropy_col1 = entropy(hist_col1)
-                    entropy_col2 = entropy(hist_col2)
-                    nmi = mi / np.sqrt(entropy_col1 * entropy_col2)
-                    normalized_mutual_info[(col1, col2)] = nmi
-                    progress_bar.update(1)
+        for i in range(num_columns):
+            for j in range(i + 1, num_columns):
+                hist_joint = np.bincount(
+                    binned[i] * num_bins + binned[j],
+                    minlength=num_bins * num_bins,
+                ).reshape(num_bins, num_bins)
+                mi = mutual_information(hist_joint)
+                nmi = mi / np.sqrt(entropies[i] * entropies[j])
+                normalized_mutual_info[(columns[i], columns[j])] = nmi
+                normalized_mutual_info[(columns[j], columns[i])] = nmi
+            progress_bar.update(num_columns - 1 - i)
     mi_diff_df = pd.DataFrame(
         normalized_mutual_info.items(), columns=["Residue Pair", "MI Difference"]
     )
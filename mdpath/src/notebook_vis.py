@@ -16,6 +16,28 @@ def load_precomputed_data(json_path: str) -> dict:
     return precomputed_data
 
 
+def ngl_shape_script(name: str, cylinders: list[list[float]]) -> str:
+    """Generates the NGL script adding one shape made of cylinders to the stage.
+
+    Args:
+        name (str): Name of the NGL shape.
+        cylinders (list[list[float]]): Cylinder parameters, each start coordinates, end coordinates, color and radius.
+
+    Returns:
+        shape_script (str): JavaScript code block creating the shape.
+    """
+    return f"""
+        {{
+        const shape = new NGL.Shape('{name}');
+        {json.dumps(cylinders)}.forEach(function (c) {{
+            shape.addCylinder([c[0], c[1], c[2]], [c[3], c[4], c[5]], [c[6], c[7], c[8]], c[9]);
+        }});
+        const shapeComp = this.stage.addComponentFromObject(shape);
+        shapeComp.addRepresentation('buffer');
+        }}
+    """
+
+
 def generate_ngl_script(precomputed_data: dict, view: nv.NGLWidget) -> None:
     """Generates NGL script and edits view for visualizing precomputed cluster pathways as cones between residues.
 
@@ -36,25 +58,21 @@ def generate_ngl_script(precomputed_data: dict, view: nv.NGLWidget) -> None:
         if key not in pathways:
             pathways[key] = []
 
-        shape_segment = f"""
-            shape.addCylinder([{prop["coord1"][0]}, {prop["coord1"][1]}, {prop["coord1"][2]}], 
-                              [{prop["coord2"][0]}, {prop["coord2"][1]}, {prop["coord2"][2]}], 
-                              [{prop["color"][0]}, {prop["color"][1]}, {prop["color"][2]}], 
-                              {prop["radius"]});
-        """
-        pathways[key].append(shape_segment)
-
-    for (clusterid, pathway_index), shape_segments in pathways.items():
-        shape_script = f"""
-            var shape = new NGL.Shape('Cluster{clusterid}_Pathway{pathway_index}');
-            {"".join(shape_segments)}
-            var shapeComp = this.stage.addComponentFromObject(shape);
-            shapeComp.addRepresentation('buffer');
-        """
-        if view:
-            view._execute_js_code(shape_script)
-        else:
-            print("View is not defined.")
+        cylinder = [*prop["coord1"], *prop["coord2"], *prop["color"], prop["radius"]]
+        pathways[key].append(cylinder)
+
+    shape_scripts = []
+    for (clusterid, pathway_index), cylinders in pathways.items():
+        shape_scripts.append(
+            ngl_shape_script(f"Cluster{clusterid}_Pathway{pathway_index}", cylinders)
+        )
+
+    if not shape_scripts:
+        return
+    if view:
+        view._execute_js_code("".join(shape_scripts))
+    else:
+        print("View is not defined.")
 
 
 def generate_cluster_ngl_script(precomputed_data: dict, view: nv.NGLWidget) -> None:
@@ -74,22 +92,16 @@ def generate_cluster_ngl_script(precomputed_data: dict, view: nv.NGLWidget) -> N
         if clusterid not in cluster_shapes:
             cluster_shapes[clusterid] = []
 
-        shape_segment = f"""
-            shape.addCylinder([{prop["coord1"][0]}, {prop["coord1"][1]}, {prop["coord1"][2]}], 
-                              [{prop["coord2"][0]}, {prop["coord2"][1]}, {prop["coord2"][2]}], 
-                              [{prop["color"][0]}, {prop["color"][1]}, {prop["color"][2]}], 
-                              {prop["radius"]});
-        """
-        cluster_shapes[clusterid].append(shape_segment)
-
-    for clusterid, shape_segments in cluster_shapes.items():
-        shape_script = f"""
-            var shape = new NGL.Shape('Cluster{clusterid}');
-            {"".join(shape_segments)}
-            var shapeComp = this.stage.addComponentFromObject(shape);
-            shapeComp.addRepresentation('buffer');
-        """
-        if view:
-            view._execute_js_code(shape_script)
-        else:
-            print("View is not defined.")
+        cylinder = [*prop["coord1"], *prop["coord2"], *prop["color"], prop["radius"]]
+        cluster_shapes[clusterid].append(cylinder)
+
+    shape_scripts = []
+    for clusterid, cylinders in cluster_shapes.items():
+        shape_scripts.append(ngl_shape_script(f"Cluster{clusterid}", cylinders))
+
+    if not shape_scripts:
+        return
+    if view:
+        view._execute_js_code("".join(shape_scripts))
+    else:
+        print("View is not defined.")
@@ -1,3 +1,5 @@
+import math
+import pickle
 from tqdm import tqdm
 import numpy as np
 import pandas as pd
@@ -5,7 +7,11 @@ import MDAnalysis as mda
 from MDAnalysis.analysis.dihedrals import Dihedral
 from multiprocessing import Pool
 from Bio import PDB
-from itertools import combinations
+from scipy.spatial import cKDTree
+
+HEAVY_ATOMS = frozenset({"C", "N", "O", "S"})
+
+worker_traj = None
 
 
 def res_num_from_pdb(pdb: str) -> tuple[int, int]:
@@ -20,16 +26,25 @@ def res_num_from_pdb(pdb: str) -> tuple[int, int]:
     """
     parser = PDB.PDBParser(QUIET=True)
     structure = parser.get_structure("protein", pdb)
-    first_res_num = float("inf")
-    last_res_num = float("-inf")
-    for res in structure.get_residues():
-        if PDB.Polypeptide.is_aa(res):
-            res_num = res.id[1]
-            if res_num < first_res_num:
-                first_res_num = res_num
-            if res_num > last_res_num:
-                last_res_num = res_num
-    return int(first_res_num), int(last_res_num)
+    is_aa = PDB.Polypeptide.is_aa
+    res_nums = np.fromiter(
+        (res.id[1] for res in structure.get_residues() if is_aa(res)), dtype=np.int32
+    )
+    return int(res_nums.min()), int(res_nums.max())
+
+
+def res_num_from_universe(traj: mda.Universe) -> tuple[int, int]:
+    """Gets first and last protein residue number from an MDAnalysis universe.
+
+    Args:
+        traj (mda.Universe): MDAnalysis universe object containing the structure.
+
+    Returns:
+        first_res_num (int): First residue number.
+        last_res_num (int): Last residue number.
+    """
+    res_nums = traj.select_atoms("protein").residues.resids
+    return int(res_nums.min()), int(res_nums.max())
 
 
 def calc_dihedral_angle_movement(
@@ -43,30 +58,43 @@ def calc_dihedral_angle_movement(
 
     Returns:
         res_id (int): Residue number.
-        dihedral_angle_movement (np.array): Dihedral angle movement for the residue over the course of the trajectory.
+        dihedral_angle_movement (np.array | None): Dihedral angle movement for the residue over the course of the trajectory, None if the residue has no phi angle.
     """
     res = traj.residues[res_id]
-    ags = [res.phi_selection()]
-    R = Dihedral(ags).run()
+    phi = res.phi_selection()
+    if phi is None:
+        return res_id, None
+    R = Dihedral([phi]).run()
     dihedrals = R.results.angles
-    dihedral_angle_movement = np.diff(dihedrals, axis=0)
+    dihedral_angle_movement = np.ascontiguousarray(
+        np.diff(dihedrals, axis=0).ravel(), dtype=np.float32
+    )
     return res_id, dihedral_angle_movement
 
 
-def calc_dihedral_angle_movement_wrapper(
-    args: tuple[int, mda.Universe]
-) -> tuple[int, np.array]:
-    """Wrapper function for calculating dihedral angle movement for a residue over the course of the MD trajectory.
+def init_dihedral_worker(traj: bytes) -> None:
+    """Unpickles the trajectory once per worker process for parallel dihedral angle calculations.
+
+    Every worker gets its own copy with its own trajectory reader, forked workers would otherwise share one open file.
 
     Args:
-        args (tuple[int, mda.Universe]): Tuple containing residue number and MDAnalysis Universe object.
+        traj (bytes): Pickled MDAnalysis Universe object containing the trajectory.
+    """
+    global worker_traj
+    worker_traj = pickle.loads(traj)
+
+
+def calc_dihedral_angle_movement_wrapper(res_id: int) -> tuple[int, np.array]:
+    """Wrapper function for calculating dihedral angle movement for a residue in a worker process.
+
+    Args:
+        res_id (int): Residue number.
 
     Returns:
         res_id (int): Residue number.
-        dihedral_angle_movement (np.array): Dihedral angle movement for the residue over the course of the trajectory.
+        dihedral_angle_movement (np.array | None): Dihedral angle movement for the residue over the course of the trajectory, None if the residue has no phi angle.
     """
-    residue_id, traj = args
-    return calc_dihedral_angle_movement(residue_id, traj)
+    return calc_dihedral_angle_movement(res_id, worker_traj)
 
 
 def calculate_dihedral_movement_parallel(
@@ -88,31 +116,82 @@ def calculate_dihedral_movement_parallel(
     Returns:
         df_all_residues (pd.DataFrame): Pandas dataframe with all residue dihedral angle movements.
     """
+    residue_movements = {}
     try:
-        with Pool(processes=num_parallel_processes) as pool:
-            residue_args = [(i, traj) for i in range(first_res_num, last_res_num + 1)]
-            df_all_residues = pd.DataFrame()
+        with Pool(
+            processes=num_parallel_processes,
+            initializer=init_dihedral_worker,
+            initargs=(pickle.dumps(traj),),
+        ) as pool:
             with tqdm(
                 total=num_residues,
                 ascii=True,
                 desc="\033[1mProcessing residue dihedral movements\033[0m",
             ) as pbar:
                 for res_id, result in pool.imap_unordered(
-                    calc_dihedral_angle_movement_wrapper, residue_args
+                    calc_dihedral_angle_movement_wrapper,
+                    range(first_res_num, last_res_num + 1),
                 ):
-                    try:
-                        df_residue = pd.DataFrame(result, columns=[f"Res {res_id}"])
-                        df_all_residues = pd.concat(
-                            [df_all_residues, df_residue], axis=1
-                        )
-                        pbar.update(1)
-                    except Exception as e:
-                        print(f"\033[1mError processing residue {res_id}: {e}\033[0m")
+                    pbar.update(1)
+                    if result is None:
+                        continue
+                    residue_movements[res_id] = result
     except Exception as e:
         print(f"{e}")
+    if not residue_movements:
+        return pd.DataFrame()
+    res_ids = sorted(residue_movements)
+    dihedral_angle_movement = np.empty(
+        (len(residue_movements[res_ids[0]]), len(res_ids)), dtype=np.float32
+    )
+    for column, res_id in enumerate(res_ids):
+        dihedral_angle_movement[:, column] = residue_movements[res_id]
+    df_all_residues = pd.DataFrame(
+        dihedral_angle_movement, columns=[f"Res {res_id}" for res_id in res_ids]
+    )
     return df_all_residues
 
 
+def calculate_dihedral_movement(
+    first_res_num: int,
+    last_res_num: int,
+    traj: mda.Universe,
+    num_parallel_processes: int = 1,
+) -> pd.DataFrame:
+    """Calculates dihedral angle movement for all residues in a single pass over the trajectory.
+
+    Args:
+        first_res_num (int): First residue number.
+        last_res_num (int): Last residue number.
+        traj (mda.Universe): MDAnalysis Universe object containing the trajectory.
+        num_parallel_processes (int, optional): Amount of parallel processes, each analysing a chunk of frames. Defaults to 1.
+
+    Returns:
+        df_all_residues (pd.DataFrame): Pandas dataframe with all residue dihedral angle movements.
+    """
+    res_ids = []
+    ags = []
+    for res_id, res in enumerate(
+        traj.residues[first_res_num : last_res_num + 1], start=first_res_num
+    ):
+        phi = res.phi_selection()
+        if phi is not None:
+            res_ids.append(res_id)
+            ags.append(phi)
+    if not ags:
+        return pd.DataFrame()
+    if num_parallel_processes > 1:
+        R = Dihedral(ags).run(
+            backend="multiprocessing", n_workers=num_parallel_processes
+        )
+    else:
+        R = Dihedral(ags).run(verbose=True)
+    dihedral_angle_movement = np.diff(R.results.angles, axis=0).astype(np.float32)
+    return pd.DataFrame(
+        dihedral_angle_movement, columns=[f"Res {res_id}" for res_id in res_ids]
+    )
+
+
 def calculate_distance(atom1: int, atom2: int) -> float:
     """Calculates the distance between two atoms.
 
@@ -123,11 +202,145 @@ def calculate_distance(atom1: int, atom2: int) -> float:
     Returns:
         distance (float): Normalized distance between the two atoms.
     """
-    distance_vector = [atom1[i] - atom2[i] for i in range(min(len(atom1), len(atom2)))]
-    distance = np.linalg.norm(distance_vector)
+    distance = math.hypot(*(coord1 - coord2 for coord1, coord2 in zip(atom1, atom2)))
     return distance
 
 
+def heavy_atom_coordinates(pdb_file: str) -> tuple[np.ndarray, np.ndarray]:
+    """Collects the heavy atom coordinates of all amino acid residues in a PDB structure.
+
+    Args:
+        pdb_file (str): Path to PDB file.
+
+    Returns:
+        coords (np.ndarray): Heavy atom coordinates with shape (n_atoms, 3).
+        res_ids (np.ndarray): Residue number of every heavy atom.
+    """
+    parser = PDB.PDBParser(QUIET=True)
+    structure = parser.get_structure("pdb_structure", pdb_file)
+    residues = [res for res in structure.get_residues() if PDB.Polypeptide.is_aa(res)]
+    residue_coords = [
+        [atom.coord for atom in res if atom.element in HEAVY_ATOMS] for res in residues
+    ]
+    coords = np.asarray(
+        [coord for res_coords in residue_coords for coord in res_coords],
+        dtype=np.float32,
+    ).reshape(-1, 3)
+    res_ids = np.repeat(
+        np.asarray([res.get_id()[1] for res in residues], dtype=np.int32),
+        [len(res_coords) for res_coords in residue_coords],
+    )
+    return coords, res_ids
+
+
+def universe_heavy_atom_coordinates(
+    traj: mda.Universe, first_res_num: int, last_res_num: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Collects the heavy atom coordinates of protein residues in the current frame of a trajectory.
+
+    Args:
+        traj (mda.Universe): MDAnalysis universe object containing the trajectory.
+        first_res_num (int): The first residue number to consider.
+        last_res_num (int): The last residue number to consider.
+
+    Returns:
+        coords (np.ndarray): Heavy atom coordinates with shape (n_atoms, 3).
+        res_ids (np.ndarray): Residue number of every heavy atom.
+    """
+    heavy = traj.select_atoms(
+        f"protein and not name H* and resid {first_res_num}:{last_res_num}"
+    )
+    coords = heavy.positions.astype(np.float32, copy=False)
+    res_ids = heavy.resids.astype(np.int32)
+    return coords, res_ids
+
+
+def residue_pair_keys(pairs: np.ndarray, residues: np.ndarray) -> np.ndarray:
+    """Packs residue pairs into single integer keys for vectorized set operations.
+
+    Args:
+        pairs (np.ndarray): Residue number pairs with shape (n_pairs, 2).
+        residues (np.ndarray): All residue numbers the pairs are taken from.
+
+    Returns:
+        keys (np.ndarray): Integer key of every residue pair.
+    """
+    # Offset by the smallest residue number so negative residue numbers pack uniquely
+    offset = int(residues.min(initial=0))
+    key_base = int(residues.max(initial=0)) - offset + 1
+    pairs = np.asarray(pairs, dtype=np.int64) - offset
+    return pairs[:, 0] * key_base + pairs[:, 1]
+
+
+def residue_contacts(
+    coords: np.ndarray, res_ids: np.ndarray, end: int, cutoffs: list[float]
+) -> dict[float, pd.DataFrame]:
+    """Calculates residue pairs with heavy atoms within several distance cutoffs in a single KD-tree query.
+
+    Args:
+        coords (np.ndarray): Heavy atom coordinates with shape (n_atoms, 3).
+        res_ids (np.ndarray): Residue number of every heavy atom.
+        end (int): Last residue number.
+        cutoffs (list[float]): Distance cutoffs for close residues.
+
+    Returns:
+        contacts (dict[float, pd.DataFrame]): Pandas dataframe with close residue pairs for every cutoff.
+    """
+    within_end = res_ids <= end
+    coords = np.asarray(coords, dtype=np.float32)[within_end]
+    res_ids = res_ids[within_end]
+    tree = cKDTree(coords)
+    pairs = tree.query_pairs(r=max(cutoffs), output_type="ndarray")
+    deltas = coords[pairs[:, 0]] - coords[pairs[:, 1]]
+    squared_distances = np.einsum("ij,ij->i", deltas, deltas)
+    res_pairs = np.sort(res_ids[pairs].astype(np.int64), axis=1)
+    mask = res_pairs[:, 0] != res_pairs[:, 1]
+    # Reduce atom pairs to the minimum heavy atom distance of every residue pair
+    res_pairs = res_pairs[mask]
+    keys = residue_pair_keys(res_pairs, res_ids)
+    residue_keys, first_pair, inverse = np.unique(
+        keys, return_index=True, return_inverse=True
+    )
+    min_squared_distances = np.full(len(residue_keys), np.inf, dtype=np.float32)
+    np.minimum.at(min_squared_distances, inverse, squared_distances[mask])
+    residue_pairs = res_pairs[first_pair].astype(res_ids.dtype)
+    contacts = {}
+    for cutoff in cutoffs:
+        close_pairs = residue_pairs[min_squared_distances <= np.float32(cutoff) ** 2]
+        contacts[cutoff] = pd.DataFrame(close_pairs, columns=["Residue1", "Residue2"])
+    return contacts
+
+
+def distant_residues(
+    res_ids: np.ndarray, end: int, df_close_res: pd.DataFrame
+) -> pd.DataFrame:
+    """Calculates all residue pairs that are not close to each other.
+
+    Args:
+        res_ids (np.ndarray): Residue number of every heavy atom.
+        end (int): Last residue number.
+        df_close_res (pd.DataFrame): Pandas dataframe with close residue pairs.
+
+    Returns:
+        pd.DataFrame: Pandas dataframe with faraway residue pairs.
+    """
+    residues = np.unique(res_ids[res_ids <= end]).astype(np.int64)
+    first, second = np.triu_indices(len(residues), k=1)
+    # Residue pairs packed into single integer keys for a vectorized set difference
+    all_keys = residue_pair_keys(
+        np.column_stack((residues[first], residues[second])), residues
+    )
+    close_pairs = df_close_res[["Residue1", "Residue2"]].to_numpy(dtype=np.int64)
+    close_keys = residue_pair_keys(close_pairs, residues)
+    distant = ~np.isin(all_keys, close_keys)
+    return pd.DataFrame(
+        {
+            "Residue1": residues[first[distant]],
+            "Residue2": residues[second[distant]],
+        }
+    )
+
+
 def faraway_residues(pdb_file: str, end: int, dist=12.0) -> pd.DataFrame:
     """Calculates residues that are far away from each other in a PDB structure.
 
@@ -139,33 +352,9 @@ def faraway_residues(pdb_file: str, end: int, dist=12.0) -> pd.DataFrame:
     Returns:
         pd.DataFrame: Pandas dataframe with faraway residue pairs and their distance.
     """
-    parser = PDB.PDBParser(QUIET=True)
-    structure = parser.get_structure("pdb_structure", pdb_file)
-    heavy_atoms = ["C", "N", "O", "S"]
-    distant_residues = []
-    residues = [res for res in structure.get_residues() if PDB.Polypeptide.is_aa(res)]
-    for res1, res2 in tqdm(
-        combinations(residues, 2),
-        desc="\033[1mCalculating distant residues\033[0m",
-        total=len(residues) * (len(residues) - 1) // 2,
-    ):
-        res1_id = res1.get_id()[1]
-        res2_id = res2.get_id()[1]
-        if res1_id <= end and res2_id <= end:
-            are_distant = True
-            for atom1 in res1:
-                if atom1.element in heavy_atoms:
-                    for atom2 in res2:
-                        if atom2.element in heavy_atoms:
-                            distance = calculate_distance(atom1.coord, atom2.coord)
-                            if distance <= dist:
-                                are_distant = False
-                                break
-                    if not are_distant:
-                        break
-            if are_distant:
-                distant_residues.append((res1.get_id()[1], res2.get_id()[1]))
-    return pd.DataFrame(distant_residues, columns=["Residue1", "Residue2"])
+    coords, res_ids = heavy_atom_coordinates(pdb_file)
+    df_close_res = residue_contacts(coords, res_ids, end, [dist])[dist]
+    return distant_residues(res_ids, end, df_close_res)
 
 
 def close_residues(pdb_file: str, end: int, dist=10.0) -> pd.DataFrame:
@@ -179,30 +368,5 @@ def close_residues(pdb_file: str, end: int, dist=10.0) -> pd.DataFrame:
     Returns:
         pd.DataFrame: Pandas dataframe with close residue pairs and their distance.
     """
-    parser = PDB.PDBParser(QUIET=True)
-    structure = parser.get_structure("pdb_structure", pdb_file)
-    heavy_atoms = ["C", "N", "O", "S"]
-    close_residues = []
-    residues = [res for res in structure.get_residues() if PDB.Polypeptide.is_aa(res)]
-    for res1, res2 in tqdm(
-        combinations(residues, 2),
-        desc="\033[1mCalculating close residues\033[0m",
-        total=len(residues) * (len(residues) - 1) // 2,
-    ):
-        res1_id = res1.get_id()[1]
-        res2_id = res2.get_id()[1]
-        if res1_id <= end and res2_id <= end:
-            are_close = False
-            for atom1 in res1:
-                if atom1.element in heavy_atoms:
-                    for atom2 in res2:
-                        if atom2.element in heavy_atoms:
-                            distance = calculate_distance(atom1.coord, atom2.coord)
-                            if distance <= dist:
-                                are_close = True
-                                break
-                    if are_close:
-                        break
-            if are_close:
-                close_residues.append((res1_id, res2_id))
-    return pd.DataFrame(close_residues, columns=["Residue1", "Residue2"])
+    coords, res_ids = heavy_atom_coordinates(pdb_file)
+    return residue_contacts(coords, res_ids, end, [dist])[dist]
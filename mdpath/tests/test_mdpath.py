@@ -29,6 +29,7 @@ from tqdm import tqdm
 from Bio import PDB
 import os 
 import json
+import pickle
 import nglview as nv 
 import importlib.util
 import shutil
@@ -171,6 +172,22 @@ TER
     assert mdpath.src.structure.res_num_from_pdb(pdb_file) == (66, 69)
 
 
+def test_res_num_from_universe():
+    pdb_content = """
+ATOM      1  N   SER R  66     163.079 132.512 139.525  1.00 67.17           N
+ATOM      2  CA  SER R  66     162.030 133.517 139.402  1.00 67.17           C
+ATOM      3  N   MET R  67     162.906 134.456 137.345  1.00 67.62           N
+ATOM      4  CA  MET R  67     162.863 134.856 135.941  1.00 67.62           C
+ATOM      5  N   THR R  69     161.394 130.716 135.710  1.00 57.94           N
+ATOM      6  CA  THR R  69     160.061 130.137 135.858  1.00 57.94           C
+HETATM    7  O   HOH W 101     150.000 130.000 130.000  1.00 20.00           O
+TER
+"""
+    pdb_file = create_mock_pdb(pdb_content)
+    traj = mda.Universe(pdb_file)
+    assert mdpath.src.structure.res_num_from_universe(traj) == (66, 69)
+
+
 def test_faraway_residues():
     pdb_content = """
 ATOM      1  N   SER R  66     163.079 132.512 139.525  1.00 67.17           N
@@ -261,6 +278,79 @@ TER
     ), f"Expected {expected_tuples} but got {result_tuples}"
 
 
+def test_universe_heavy_atom_coordinates():
+    pdb_content = """
+ATOM      1  N   SER R  66     163.079 132.512 139.525  1.00 67.17           N
+ATOM      2  CA  SER R  66     162.030 133.517 139.402  1.00 67.17           C
+ATOM      3  H   SER R  66     162.500 133.000 139.000  1.00 67.17           H
+ATOM      4  N   MET R  67     162.906 134.456 137.345  1.00 67.62           N
+ATOM      5  SD  MET R  67     162.847 137.472 133.944  1.00 67.62           S
+ATOM      6  N   ILE R  68     163.445 132.569 135.314  1.00 62.30           N
+TER
+"""
+    pdb_file = create_mock_pdb(pdb_content)
+    traj = mda.Universe(pdb_file)
+    coords, res_ids = mdpath.src.structure.universe_heavy_atom_coordinates(
+        traj, 66, 67
+    )
+    expected_coords, expected_res_ids = mdpath.src.structure.heavy_atom_coordinates(
+        pdb_file
+    )
+
+    assert coords.dtype == np.float32
+    np.testing.assert_array_equal(res_ids, [66, 66, 67, 67])
+    np.testing.assert_allclose(coords, expected_coords[:4], atol=1e-3)
+    np.testing.assert_array_equal(res_ids, expected_res_ids[:4])
+
+
+def test_residue_contacts_and_distant_residues():
+    rng = np.random.default_rng(42)
+    residues = np.array([-7, -3, -2, -1, 0, 4, 5, 12, 30, 31])
+    res_ids = np.repeat(residues, 3)
+    coords = rng.uniform(0.0, 20.0, size=(len(res_ids), 3)).astype(np.float32)
+    end = 30
+    cutoffs = [12.0, 10.0, 5.0]
+
+    contacts = mdpath.src.structure.residue_contacts(coords, res_ids, end, cutoffs)
+
+    def pairs_within(dist):
+        pairs = set()
+        for i, j in zip(*np.triu_indices(len(res_ids), k=1)):
+            res1, res2 = sorted((res_ids[i], res_ids[j]))
+            if res1 == res2 or res2 > end:
+                continue
+            if np.linalg.norm(coords[i] - coords[j]) <= dist:
+                pairs.add((res1, res2))
+        return pairs
+
+    all_pairs = {
+        (res1, res2)
+        for i, res1 in enumerate(residues[residues <= end])
+        for res2 in residues[residues <= end][i + 1 :]
+    }
+    for cutoff in cutoffs:
+        single = mdpath.src.structure.residue_contacts(
+            coords, res_ids, end, [cutoff]
+        )[cutoff]
+        pd.testing.assert_frame_equal(contacts[cutoff], single)
+        close_pairs = set(
+            contacts[cutoff][["Residue1", "Residue2"]].itertuples(index=False, name=None)
+        )
+        assert close_pairs == pairs_within(cutoff)
+
+        df_distant = mdpath.src.structure.distant_residues(
+            res_ids, end, contacts[cutoff]
+        )
+        distant_pairs = set(
+            df_distant[["Residue1", "Residue2"]].itertuples(index=False, name=None)
+        )
+        assert distant_pairs == all_pairs - close_pairs
+
+    graph = mdpath.src.graph.contact_graph(contacts[5.0])
+    assert {tuple(sorted(edge)) for edge in graph.edges} == pairs_within(5.0)
+    assert all(weight == 0 for _, _, weight in graph.edges(data="weight"))
+
+
 def test_graph_building():
     pdb_content = """
 ATOM      1  N   SER R  66     163.079 132.512 139.525  1.00 67.17           N
@@ -310,9 +400,7 @@ def test_calc_dihedral_angle_movement(mocker):
     mock_universe.residues = [mock_residue] * 10
 
     mock_dihedral = MagicMock(spec=Dihedral)
-    mock_dihedral.run.return_value.results.angles = np.array(
-        [[10.0, 20.0, 30.0], [15.0, 25.0, 35.0], [20.0, 30.0, 40.0]]
-    )
+    mock_dihedral.run.return_value.results.angles = np.array([[10.0], [15.0], [25.0]])
     mocker.patch("mdpath.src.structure.Dihedral", return_value=mock_dihedral)
 
     residue_index = 0
@@ -320,13 +408,60 @@ def test_calc_dihedral_angle_movement(mocker):
         residue_index, mock_universe
     )
 
-    expected_movement = np.diff(
-        np.array([[10.0, 20.0, 30.0], [15.0, 25.0, 35.0], [20.0, 30.0, 40.0]]), axis=0
-    )
+    expected_movement = np.array([5.0, 10.0], dtype=np.float32)
 
     assert i == residue_index
+    assert dihedral_angle_movement.dtype == np.float32
+    assert dihedral_angle_movement.flags["C_CONTIGUOUS"]
     np.testing.assert_array_equal(dihedral_angle_movement, expected_movement)
 
+    mock_residue.phi_selection.return_value = None
+    dihedral_class = mocker.patch("mdpath.src.structure.Dihedral")
+    i, dihedral_angle_movement = mdpath.src.structure.calc_dihedral_angle_movement(
+        residue_index, mock_universe
+    )
+    assert i == residue_index
+    assert dihedral_angle_movement is None
+    dihedral_class.assert_not_called()
+
+
+def test_calculate_dihedral_movement(mocker):
+    mock_universe = MagicMock(spec=mda.Universe)
+    mock_residue = MagicMock()
+    mock_residue.phi_selection.return_value = "phi_selection_mock"
+    mock_terminal = MagicMock()
+    mock_terminal.phi_selection.return_value = None
+    mock_universe.residues = [mock_terminal] + [mock_residue] * 3 + [mock_terminal]
+
+    mock_dihedral = MagicMock(spec=Dihedral)
+    mock_dihedral.run.return_value.results.angles = np.array(
+        [[10.0, 20.0, 30.0], [15.0, 25.0, 35.0], [20.0, 30.0, 40.0]]
+    )
+    mock_dihedral_class = mocker.patch(
+        "mdpath.src.structure.Dihedral", return_value=mock_dihedral
+    )
+
+    df = mdpath.src.structure.calculate_dihedral_movement(0, 4, mock_universe)
+
+    mock_dihedral_class.assert_called_once_with(["phi_selection_mock"] * 3)
+    expected_df = pd.DataFrame(
+        [[5.0, 5.0, 5.0], [5.0, 5.0, 5.0]],
+        columns=["Res 1", "Res 2", "Res 3"],
+        dtype=np.float32,
+    )
+    pd.testing.assert_frame_equal(df, expected_df)
+
+    df_parallel = mdpath.src.structure.calculate_dihedral_movement(
+        0, 4, mock_universe, num_parallel_processes=2
+    )
+    mock_dihedral.run.assert_called_with(backend="multiprocessing", n_workers=2)
+    pd.testing.assert_frame_equal(df_parallel, expected_df)
+
+    mock_dihedral_class.reset_mock()
+    df_empty = mdpath.src.structure.calculate_dihedral_movement(0, 0, mock_universe)
+    mock_dihedral_class.assert_not_called()
+    pd.testing.assert_frame_equal(df_empty, pd.DataFrame())
+
 
 def mock_calc_dihedral_angle_movement(residue_id, traj):
     return residue_id, np.array([1.0, 2.0, 3.0])
@@ -337,13 +472,13 @@ def mock_calc_dihedral_angle_movement(residue_id, traj):
     side_effect=mock_calc_dihedral_angle_movement,
 )
 def test_calc_dihedral_angle_movement_wrapper(mock_calc_func):
-    mock_universe = Mock(spec=mda.Universe)
+    universe = "universe"
     residue_id = 42
-    args = (residue_id, mock_universe)
-    result = mdpath.src.structure.calc_dihedral_angle_movement_wrapper(args)
+    mdpath.src.structure.init_dihedral_worker(pickle.dumps(universe))
+    result = mdpath.src.structure.calc_dihedral_angle_movement_wrapper(residue_id)
     assert result[0] == residue_id
     np.testing.assert_array_equal(result[1], np.array([1.0, 2.0, 3.0]))
-    mock_calc_func.assert_called_once_with(residue_id, mock_universe)
+    mock_calc_func.assert_called_once_with(residue_id, universe)
 
 
 def mock_calc_dihedral_angle_movement(residue_id, traj):
@@ -355,9 +490,8 @@ def mock_calc_dihedral_angle_movement(residue_id, traj):
         return residue_id, np.array([], dtype=np.int64)
 
 
-def mock_calc_dihedral_angle_movement_wrapper(args):
-    res_id, traj = args
-    return mock_calc_dihedral_angle_movement(res_id, traj)
+def mock_calc_dihedral_angle_movement_wrapper(res_id):
+    return mock_calc_dihedral_angle_movement(res_id, None)
 
 
 @patch("mdpath.src.structure.Pool")
@@ -367,13 +501,14 @@ def mock_calc_dihedral_angle_movement_wrapper(args):
 )
 @patch("mdpath.src.structure.tqdm", return_value=MagicMock())
 def test_calculate_dihedral_movement_parallel(mock_tqdm, mock_wrapper, mock_pool):
-    mock_traj = MagicMock()
+    mock_traj = "traj"
     mock_pool_instance = MagicMock()
     mock_pool.return_value.__enter__.return_value = mock_pool_instance
     mock_pool_instance.imap_unordered.return_value = iter(
         [
-            (1, np.array([[30], [45]], dtype=np.int64)),
-            (2, np.array([[50], [65]], dtype=np.int64)),
+            (2, np.array([50, 65], dtype=np.float32)),
+            (0, None),
+            (1, np.array([30, 45], dtype=np.float32)),
         ]
     )
 
@@ -385,9 +520,15 @@ def test_calculate_dihedral_movement_parallel(mock_tqdm, mock_wrapper, mock_pool
         traj=mock_traj,
     )
 
-    expected_df = pd.DataFrame({"Res 1": [30, 45], "Res 2": [50, 65]}, dtype=np.int64)
+    expected_df = pd.DataFrame({"Res 1": [30, 45], "Res 2": [50, 65]}, dtype=np.float32)
 
     pd.testing.assert_frame_equal(df, expected_df)
+    mock_pool.assert_called_once_with(
+        processes=2,
+        initializer=mdpath.src.structure.init_dihedral_worker,
+        initargs=(pickle.dumps(mock_traj),),
+    )
+    mock_pool_instance.imap_unordered.assert_called_once_with(mock_wrapper, range(1, 3))
 
     df_empty = mdpath.src.structure.calculate_dihedral_movement_parallel(
         num_parallel_processes=2,
@@ -417,6 +558,38 @@ def test_calculate_dihedral_movement_parallel(mock_tqdm, mock_wrapper, mock_pool
     pd.testing.assert_frame_equal(df_error, expected_df_error)
 
 
+def test_calculate_dihedral_movement_parallel_universes():
+    script_dir = os.path.dirname(__file__)
+    topology = os.path.join(script_dir, "test_topology.pdb")
+    trajectory = os.path.join(script_dir, "test_trajectory.dcd")
+    dcd_traj = mda.Universe(topology, trajectory)
+    transferred_traj = mda.Universe(topology, trajectory)
+    transferred_traj.transfer_to_memory(stop=5)
+    memory_traj = mda.Universe(
+        topology,
+        transferred_traj.trajectory.coordinate_array.copy(),
+        format=mda.coordinates.memory.MemoryReader,
+    )
+    assert memory_traj.trajectory.filename is None
+
+    # Workers reading the same DCD file failed intermittently, so repeat the file-backed run
+    universes = [dcd_traj] * 3 + [transferred_traj, memory_traj]
+    for universe in universes:
+        df = mdpath.src.structure.calculate_dihedral_movement_parallel(
+            num_parallel_processes=2,
+            first_res_num=1,
+            last_res_num=40,
+            num_residues=40,
+            traj=universe,
+        )
+        assert df.shape == (len(universe.trajectory) - 1, 40)
+        for res_id in range(1, 41):
+            _, expected = mdpath.src.structure.calc_dihedral_angle_movement(
+                res_id, universe
+            )
+            np.testing.assert_array_equal(df[f"Res {res_id}"].to_numpy(), expected)
+
+
 def test_graph_assign_weights():
     G = nx.Graph()
     G.add_edges_from([(1, 2), (2, 3), (3, 4)])
@@ -441,6 +614,35 @@ def test_graph_assign_weights():
             ), f"Unexpected weight for edge {edge}"
 
 
+def test_max_weight_shortest_paths_from_source():
+    G = nx.Graph()
+    G.add_edge(1, 2, weight=1.0)
+    G.add_edge(2, 3, weight=2.0)
+    G.add_edge(1, 3, weight=4.0)
+    G.add_edge(3, 4, weight=1.0)
+    G.add_edge(2, 4, weight=3.0)
+    G.add_edge(5, 6, weight=1.0)
+
+    graph_arrays = mdpath.src.graph.graph_arrays(G)
+    paths = mdpath.src.graph.max_weight_shortest_paths_from_source(
+        graph_arrays, 1, [4, 3, 2, 1, 6, 7]
+    )
+
+    assert paths == [
+        ([1, 3, 4], 5.0),
+        ([1, 3], 4.0),
+        ([1, 2], 1.0),
+        ([1], 0.0),
+        None,
+        None,
+    ]
+    for target, path in zip([4, 3, 2], paths):
+        assert path == mdpath.src.graph.max_weight_shortest_path(G, 1, target)
+
+    with pytest.raises(nx.NodeNotFound):
+        mdpath.src.graph.max_weight_shortest_paths_from_source(graph_arrays, 7, [1])
+
+
 def test_collect_path_total_weights():
     G = nx.Graph()
     G.add_edge(1, 2, weight=10)
@@ -448,34 +650,53 @@ def test_collect_path_total_weights():
     G.add_edge(1, 3, weight=15)
 
     df = pd.DataFrame({"Residue1": [1, 2], "Residue2": [3, 4]})
+    result = mdpath.src.graph.collect_path_total_weights(G, df)
+    assert result == [([1, 3], 15.0)]
 
-    # Test cases
-    test_cases = [
-        {
-            "mock_side_effect": [([1, 2, 3], 30), nx.NetworkXNoPath],
-            "expected_result": [([1, 2, 3], 30)],
-        },
-        {
-            "mock_side_effect": [nx.NetworkXNoPath, nx.NetworkXNoPath],
-            "expected_result": [],
-        },
-        {
-            "mock_side_effect": [([1, 2, 3], 30), nx.NetworkXNoPath],
-            "df": pd.DataFrame(columns=["Residue1", "Residue2"]),
-            "expected_result": [],
-        },
-    ]
+    df = pd.DataFrame({"Residue1": [1, 2, 1], "Residue2": [2, 4, 3]})
+    result = mdpath.src.graph.collect_path_total_weights(G, df)
+    assert result == [([1, 2], 10.0), ([1, 3], 15.0)]
+
+    df = pd.DataFrame(columns=["Residue1", "Residue2"])
+    result = mdpath.src.graph.collect_path_total_weights(G, df)
+    assert result == []
+
+
+def test_collect_path_total_weights_parallel():
+    G = nx.Graph()
+    G.add_edge(1, 2, weight=1.0)
+    G.add_edge(2, 3, weight=2.0)
+    G.add_edge(1, 3, weight=4.0)
+    G.add_edge(3, 4, weight=1.0)
+    G.add_edge(2, 4, weight=3.0)
+    G.add_node(5)
 
-    for case in test_cases:
-        with patch(
-            "mdpath.src.graph.max_weight_shortest_path"
-        ) as mock_max_weight_shortest_path:
-            mock_max_weight_shortest_path.side_effect = case["mock_side_effect"]
+    df = pd.DataFrame({"Residue1": [1, 1, 2, 1], "Residue2": [4, 3, 4, 5]})
 
-            df_test = case.get("df", df)
-            result = mdpath.src.graph.collect_path_total_weights(G, df_test)
+    serial = mdpath.src.graph.collect_path_total_weights(G, df)
+    parallel = mdpath.src.graph.collect_path_total_weights(G, df, num_processes=2)
 
-            assert result == case["expected_result"]
+    assert serial == [([1, 3, 4], 5.0), ([1, 3], 4.0), ([2, 4], 3.0)]
+    assert parallel == serial
+
+
+def test_mutual_information():
+    from sklearn.metrics import mutual_info_score
+
+    rng = np.random.default_rng(42)
+    hist_joint = rng.integers(0, 10, size=(35, 35))
+    expected_mi = mutual_info_score(None, None, contingency=hist_joint)
+    assert mdpath.src.mutual_information.mutual_information(
+        hist_joint
+    ) == pytest.approx(expected_mi)
+
+    independent = np.outer([1, 2, 3], [4, 5, 6])
+    assert mdpath.src.mutual_information.mutual_information(
+        independent
+    ) == pytest.approx(0.0, abs=1e-12)
+
+    single_bin = np.array([[5, 0], [0, 0]])
+    assert mdpath.src.mutual_information.mutual_information(single_bin) == 0.0
 
 
 def test_nmi_calc(mocker):
@@ -511,6 +732,10 @@ def test_nmi_calc(mocker):
         result["MI Difference"] >= 0
     ).all(), "MI Difference values should be non-negative"
 
+    mock_tqdm = mocker.patch("mdpath.src.mutual_information.tqdm")
+    mdpath.src.mutual_information.NMI_calc(df_all_residues, quiet=True)
+    assert mock_tqdm.call_args.kwargs["disable"] is True
+
 
 def test_calculate_overlap_for_pathway():
     df_basic = pd.DataFrame({"Residue1": [1, 2, 3, 4], "Residue2": [2, 3, 4, 5]})
@@ -553,27 +778,32 @@ def test_calculate_overlap_for_pathway():
     assert result_empty_df == expected_empty_df
 
 
-@patch("mdpath.src.cluster.calculate_overlap_parallel")
-def test_calculate_overlap_parallel(mock_calculate_overlap_parallel):
-    pathways = [[1, 2], [2, 3], [3, 4]]
-    df = pd.DataFrame({"Residue1": [1, 2, 3], "Residue2": [2, 3, 4]})
-    num_processes = 2
+def test_calculate_overlap_parallel():
+    pathways = [[1, 2], [2, 3], [3, 4], [1, 1, 4]]
+    df = pd.DataFrame({"Residue1": [1, 2, 3, 4], "Residue2": [2, 3, 4, 7]})
+
+    result_df = mdpath.src.cluster.calculate_overlap_parallel(pathways, df)
 
-    # Expected result
     expected_data = [
-        {"Pathway1": 0, "Pathway2": 1, "Overlap": 1},
-        {"Pathway1": 1, "Pathway2": 0, "Overlap": 1},
-        {"Pathway1": 0, "Pathway2": 2, "Overlap": 0},
-        {"Pathway1": 2, "Pathway2": 0, "Overlap": 0},
-        {"Pathway1": 1, "Pathway2": 2, "Overlap": 1},
-        {"Pathway1": 2, "Pathway2": 1, "Overlap": 1},
+        row
+        for i, path in enumerate(pathways)
+        for row in mdpath.src.cluster.calculate_overlap_for_pathway(
+            (i, path, pathways, df)
+        )
     ]
     expected_df = pd.DataFrame(expected_data)
-    mock_calculate_overlap_parallel.return_value = expected_df
-    result_df = mdpath.src.cluster.calculate_overlap_parallel(
-        pathways, df, num_processes
+    sort_columns = ["Pathway1", "Pathway2"]
+    pd.testing.assert_frame_equal(
+        result_df.sort_values(sort_columns).reset_index(drop=True),
+        expected_df.sort_values(sort_columns).reset_index(drop=True),
     )
-    pd.testing.assert_frame_equal(result_df, expected_df)
+    overlap = result_df.set_index(sort_columns)["Overlap"]
+    assert overlap[(0, 1)] == 2
+    assert overlap[(0, 2)] == 1
+    assert overlap[(1, 2)] == 2
+    assert overlap[(0, 3)] == 2
+    assert overlap[(1, 3)] == 3
+
 
 def test_pathways_cluster(tmp_path):
     data = {
@@ -854,15 +1084,17 @@ def test_generate_ngl_script(mocker):
     mdpath.src.notebook_vis.generate_ngl_script(precomputed_data, mock_view)
     
     expected_js_code = """
-        var shape = new NGL.Shape('Cluster1_Pathway0');
-        shape.addCylinder([1.0, 2.0, 3.0], 
-                          [4.0, 5.0, 6.0], 
-                          [0.5, 0.5, 0.5], 
-                          0.1);
-        var shapeComp = this.stage.addComponentFromObject(shape);
+        {
+        const shape = new NGL.Shape('Cluster1_Pathway0');
+        [[1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 0.5, 0.5, 0.5, 0.1]].forEach(function (c) {
+            shape.addCylinder([c[0], c[1], c[2]], [c[3], c[4], c[5]], [c[6], c[7], c[8]], c[9]);
+        });
+        const shapeComp = this.stage.addComponentFromObject(shape);
         shapeComp.addRepresentation('buffer');
+        }
     """
     
+    mock_view._execute_js_code.assert_called_once()
     actual_js_code = mock_view._execute_js_code.call_args[0][0].strip()
     print(f"Actual JavaScript Code:\n{actual_js_code}\n")
     
@@ -901,52 +1133,42 @@ def test_generate_cluster_ngl_script(mocker):
     mdpath.src.notebook_vis.generate_cluster_ngl_script(precomputed_data, mock_view)
     
     expected_js_code_cluster1 = """
-        var shape = new NGL.Shape('Cluster1');
-        shape.addCylinder([1.0, 2.0, 3.0], 
-                          [4.0, 5.0, 6.0], 
-                          [0.5, 0.5, 0.5], 
-                          0.1);
-        shape.addCylinder([7.0, 8.0, 9.0], 
-                          [10.0, 11.0, 12.0], 
-                          [0.2, 0.3, 0.4], 
-                          0.2);
-        var shapeComp = this.stage.addComponentFromObject(shape);
+        {
+        const shape = new NGL.Shape('Cluster1');
+        [[1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 0.5, 0.5, 0.5, 0.1], [7.0, 8.0, 9.0, 10.0, 11.0, 12.0, 0.2, 0.3, 0.4, 0.2]].forEach(function (c) {
+            shape.addCylinder([c[0], c[1], c[2]], [c[3], c[4], c[5]], [c[6], c[7], c[8]], c[9]);
+        });
+        const shapeComp = this.stage.addComponentFromObject(shape);
         shapeComp.addRepresentation('buffer');
+        }
     """
     
     expected_js_code_cluster2 = """
-        var shape = new NGL.Shape('Cluster2');
-        shape.addCylinder([13.0, 14.0, 15.0], 
-                          [16.0, 17.0, 18.0], 
-                          [0.1, 0.2, 0.3], 
-                          0.15);
-        var shapeComp = this.stage.addComponentFromObject(shape);
+        {
+        const shape = new NGL.Shape('Cluster2');
+        [[13.0, 14.0, 15.0, 16.0, 17.0, 18.0, 0.1, 0.2, 0.3, 0.15]].forEach(function (c) {
+            shape.addCylinder([c[0], c[1], c[2]], [c[3], c[4], c[5]], [c[6], c[7], c[8]], c[9]);
+        });
+        const shapeComp = this.stage.addComponentFromObject(shape);
         shapeComp.addRepresentation('buffer');
+        }
     """
 
-    actual_js_calls = [call[0][0].strip() for call in mock_view._execute_js_code.call_args_list]
-    
-    print("Actual JavaScript Code Calls:")
-    for call in actual_js_calls:
-        print(call)
-    
+    mock_view._execute_js_code.assert_called_once()
+    actual_js_code = mock_view._execute_js_code.call_args[0][0].strip()
+    print(f"Actual JavaScript Code:\n{actual_js_code}\n")
+
     def normalize_js(js_code):
         return ''.join(js_code.split())
-    
-    normalized_expected_cluster1 = normalize_js(expected_js_code_cluster1)
-    normalized_expected_cluster2 = normalize_js(expected_js_code_cluster2)
-    normalized_actual_calls = [normalize_js(call) for call in actual_js_calls]
-    
-    assert normalized_expected_cluster1 in normalized_actual_calls, (
-        f"Expected JavaScript code for cluster 1 not found in actual calls.\n"
-        f"Expected: {normalized_expected_cluster1}\n"
-        f"Actual: {normalized_actual_calls}"
+
+    normalized_expected = normalize_js(
+        expected_js_code_cluster1 + expected_js_code_cluster2
     )
-    
-    assert normalized_expected_cluster2 in normalized_actual_calls, (
-        f"Expected JavaScript code for cluster 2 not found in actual calls.\n"
-        f"Expected: {normalized_expected_cluster2}\n"
-        f"Actual: {normalized_actual_calls}"
+    normalized_actual = normalize_js(actual_js_code)
+
+    assert normalized_actual == normalized_expected, (
+        f"Expected: {normalized_expected}\n"
+        f"Actual: {normalized_actual}"
     )
 
 def test_create_bootstrap_sample():
@@ -989,7 +1211,8 @@ def graph_assign_weights(residue_graph, mi_diff_df):
 def collect_path_total_weights(residue_graph, df_distant_residues):
     return [([1, 2, 3], 1.0), ([2, 3], 0.5)]
 
-def test_process_bootstrap_sample():
+def test_process_bootstrap_sample(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
     df_all_residues = pd.DataFrame({
         'Res 1': [1, 2, 3, 4, 5],
         'Res 2': [5, 4, 3, 2, 1],
@@ -1020,10 +1243,15 @@ def test_process_bootstrap_sample():
     
     assert common_count == 2
     assert bootstrap_pathways == [[1, 2, 3], [2, 3]]
+    assert (tmp_path / "bootstrap" / "bootstrap_sample_5.txt").exists()
+    assert all(
+        "weight" not in data for _, _, data in residue_graph_empty.edges(data=True)
+    )
     print("test_process_bootstrap_sample passed.")
 
 
-def test_bootstrap_analysis():
+def test_bootstrap_analysis(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
     df_all_residues = pd.DataFrame({
         'Res 1': [1, 2, 3, 4, 5],
         'Res 2': [5, 4, 3, 2, 1],
@@ -1065,7 +1293,58 @@ def test_bootstrap_analysis():
         assert 0 <= upper_bound <= 1
 
 
-def test_mdpath_output_files():
+def test_bootstrap_analysis_parallel(tmp_path, monkeypatch):
+    df_all_residues = pd.DataFrame({
+        'Res 1': [1, 2, 3, 4, 5],
+        'Res 2': [5, 4, 3, 2, 1],
+        'Res 3': [2, 3, 4, 5, 6]
+    })
+
+    residue_graph_empty = nx.Graph()
+    residue_graph_empty.add_edges_from([(1, 2), (2, 3)])
+
+    df_distant_residues = pd.DataFrame({
+        'Residue1': [1, 2],
+        'Residue2': [3, 3]
+    })
+
+    sorted_paths = [([1, 2, 3], 1.0), ([2, 3], 0.5)]
+    num_bootstrap_samples = 4
+
+    results = {}
+    for num_processes in (1, 2):
+        run_dir = tmp_path / f"processes_{num_processes}"
+        run_dir.mkdir()
+        monkeypatch.chdir(run_dir)
+        common_counts, path_confidence_intervals = (
+            mdpath.src.bootstrap.bootstrap_analysis(
+                df_all_residues,
+                residue_graph_empty,
+                df_distant_residues,
+                sorted_paths,
+                num_bootstrap_samples=num_bootstrap_samples,
+                numpath=500,
+                num_bins=35,
+                num_processes=num_processes,
+            )
+        )
+        assert len(common_counts) == num_bootstrap_samples
+        results[num_processes] = (
+            sorted(os.listdir(run_dir / "bootstrap")),
+            set(path_confidence_intervals),
+        )
+
+    serial_files, serial_paths = results[1]
+    parallel_files, parallel_paths = results[2]
+    assert parallel_files == serial_files
+    assert parallel_files == sorted(
+        f"bootstrap_sample_{sample_num}.txt"
+        for sample_num in range(num_bootstrap_samples)
+    )
+    assert parallel_paths == serial_paths == {(1, 2, 3), (2, 3)}
+
+
+def test_mdpath_output_files(tmp_path, monkeypatch):
     script_dir = os.path.dirname(os.path.abspath(__file__))
     project_root = os.path.dirname(script_dir)
     mdpath_dir = os.path.join(project_root, 'mdpath')
@@ -1078,14 +1357,14 @@ def test_mdpath_output_files():
     assert os.path.exists(trajectory), f"Trajectory file {trajectory} does not exist."
 
     expected_files = [
-        os.path.join(script_dir, "first_frame.pdb"),
-        os.path.join(script_dir, "mi_diff_df.csv"),
-        os.path.join(script_dir, "output.txt"),
-        os.path.join(script_dir, "residue_coordinates.pkl"),
-        os.path.join(script_dir, "cluster_pathways_dict.pkl"),
-        os.path.join(script_dir, "clusters_paths.json"),
-        os.path.join(script_dir, "precomputed_clusters_paths.json"),
-        os.path.join(script_dir, "quick_precomputed_clusters_paths.json")
+        os.path.join(tmp_path, "first_frame.pdb"),
+        os.path.join(tmp_path, "mi_diff_df.csv"),
+        os.path.join(tmp_path, "output.txt"),
+        os.path.join(tmp_path, "residue_coordinates.pkl"),
+        os.path.join(tmp_path, "cluster_pathways_dict.pkl"),
+        os.path.join(tmp_path, "clusters_paths.json"),
+        os.path.join(tmp_path, "precomputed_clusters_paths.json"),
+        os.path.join(tmp_path, "quick_precomputed_clusters_paths.json")
     ]
 
     sys.path.insert(0, mdpath_dir)
@@ -1095,21 +1374,16 @@ def test_mdpath_output_files():
     except ImportError as e:
         raise ImportError(f"Error importing mdpath: {e}")
 
-    original_cwd = os.getcwd()
-    os.chdir(script_dir)
+    monkeypatch.chdir(tmp_path)
 
-    sys.argv = [
+    monkeypatch.setattr(sys, "argv", [
         "mdpath",  
         "-top", topology,
         "-traj", trajectory,
         "-numpath", numpath
-    ]
+    ])
 
     mdpath.mdpath.main()
         
     for file in expected_files:
-        assert os.path.exists(file), f"Expected output file {file} not found."
-
-    for file in expected_files:
-        if os.path.exists(file):
-            os.remove(file)
\ No newline at end of file
+        assert os.path.exists(file), f"Expected output file {file} not found."
\ No newline at end of file
@@ -19,17 +19,22 @@ def visualize_pdb(pdb_path):
 
 
 def visualize_clusters(json_path):
-    count = 0
     with open(json_path, "r") as json_file:
         clusters = json.load(json_file)
+    cluster_cylinders = {}
     for prop in clusters:
-        pos0 = [prop["coord1"][0], prop["coord1"][1], prop["coord1"][2]]
-        pos1 = [prop["coord2"][0], prop["coord2"][1], prop["coord2"][2]]
-        r = prop["radius"]
-        color = [prop["color"][0], prop["color"][1], prop["color"][2]]
-        cylinder = [cgo.CYLINDER, *pos0, *pos1, r, *color, *color]
-        cmd.load_cgo(cylinder, f"path_{count}")
-        count += 1
+        color = prop["color"]
+        cylinder = [
+            cgo.CYLINDER,
+            *prop["coord1"],
+            *prop["coord2"],
+            prop["radius"],
+            *color,
+            *color,
+        ]
+        cluster_cylinders.setdefault(prop.get("clusterid", 0), []).extend(cylinder)
+    for clusterid, cylinders in cluster_cylinders.items():
+        cmd.load_cgo(cylinders, f"cluster_{clusterid}")
 
 
 # The function to be called by PyMOL with provided arguments